@@ -1,9 +1,102 @@
 # dxf2svg_core.py
 import ezdxf
+from ezdxf.addons import iterdxf
+import functools
 import math
 import os
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom.minidom import parseString
+import numpy as np
+
+def _build_aci_table():
+    # 完整 AutoCAD 顏色索引表：1-15 沿用 README 記載的對應，16-255 取自 ezdxf 的標準調色盤
+    color_map = {
+        1: "#FF0000", 2: "#FFFF00", 3: "#00FF00", 4: "#00FFFF", 5: "#0000FF", 6: "#FF00FF", 7: "#FFFFFF", 8: "#808080", 9: "#C0C0C0", 10: "#800000", 11: "#808000", 12: "#008000", 13: "#008080", 14: "#000080", 15: "#800080",
+    }
+    from ezdxf import colors as _colors
+    return tuple(color_map.get(i, "#%06X" % _colors.DXF_DEFAULT_COLORS[i])
+                 for i in range(256))
+
+ACI_COLOR_TABLE = _build_aci_table()
+
+LINE_TEMPLATE = '<line x1="%d.%02d" y1="%d.%02d" x2="%d.%02d" y2="%d.%02d"%s/>\n'
+PATH_TEMPLATE = '<path d="%s"%s/>\n'
+PATH_SUFFIX = ('', ' Z')  # 以 closed 旗標直接索引，省掉發射迴圈內的分支
+DEGENERATE_PX_TOLERANCE = 0.5  # 正規化後位移小於此像素數的點視為重複
+
+def _fixed2(points):
+    # 輸出精度固定兩位小數：先轉成 1/100 單位的 int32，再以 %d.%02d 成對格式化，
+    # 避開浮點數轉字串的成本（座標在正規化後皆為非負值）
+    ints = np.rint(np.asarray(points) * 100).astype(np.int32)
+    whole, frac = np.divmod(ints, 100)
+    out = np.empty((len(ints), 4), dtype=np.int32)
+    out[:, 0] = whole[:, 0]
+    out[:, 1] = frac[:, 0]
+    out[:, 2] = whole[:, 1]
+    out[:, 3] = frac[:, 1]
+    return out.ravel().tolist()
+
+CIRCLE_BEZIER_KAPPA = 4 / 3 * math.tan(math.pi / 16)  # 八段 45° 圓弧的三次貝茲控制距離係數
+
+def _circle_bezier_points(cx, cy, radius):
+    # 圓用 8 段三次貝茲曲線表示：回傳 (25, 2) 控制點陣列
+    # [起點, c1, c2, 終點, c1, c2, 終點, ...]，仿射轉換下曲線形狀不變
+    angles = np.linspace(0, 2 * math.pi, 9)
+    on_curve = np.empty((9, 2))
+    on_curve[:, 0] = cx + radius * np.cos(angles)
+    on_curve[:, 1] = cy + radius * np.sin(angles)
+    tangents = np.empty((9, 2))
+    tangents[:, 0] = -radius * CIRCLE_BEZIER_KAPPA * np.sin(angles)
+    tangents[:, 1] = radius * CIRCLE_BEZIER_KAPPA * np.cos(angles)
+    control = np.empty((25, 2))
+    control[0] = on_curve[0]
+    control[1::3] = on_curve[:-1] + tangents[:-1]
+    control[2::3] = on_curve[1:] - tangents[1:]
+    control[3::3] = on_curve[1:]
+    return control
+
+ARC_CHORD_TOLERANCE = 0.5  # 像素
+MAX_ARC_SEGMENTS = 1024
+
+def _arc_segment_count(radius, sweep):
+    # 依弦高容差決定段數：步進角 θ 需滿足 r * (1 - cos(θ/2)) <= tol，
+    # 半徑以「像素」為單位傳入，誤差直接對應輸出畫面
+    if radius <= ARC_CHORD_TOLERANCE:
+        return 8
+    max_step = 2 * math.acos(1 - ARC_CHORD_TOLERANCE / radius)
+    return max(8, min(MAX_ARC_SEGMENTS, int(math.ceil(sweep / max_step))))
+
+def _arc_bbox_points(cx, cy, radius, start_angle, end_angle):
+    # 弧的精確邊界：兩端點加上掃掠範圍內的軸向極值點
+    angles = [start_angle, end_angle]
+    quadrant = math.ceil(start_angle / (math.pi / 2)) * (math.pi / 2)
+    while quadrant < end_angle:
+        angles.append(quadrant)
+        quadrant += math.pi / 2
+    points = np.empty((len(angles), 2))
+    points[:, 0] = cx + radius * np.cos(angles)
+    points[:, 1] = cy + radius * np.sin(angles)
+    return points
+
+def _tessellate_arc(cx, cy, radius, start_angle, end_angle, num_segments):
+    # 角度加法遞推：整段弧只需對起始角與步進角各做一次 sin/cos，
+    # 其餘取樣點由單位複數連乘得到（每 1024 步重新定錨避免誤差累積）
+    step = (end_angle - start_angle) / num_segments
+    rotation = complex(math.cos(step), math.sin(step))
+    z = np.empty(num_segments + 1, dtype=np.complex128)
+    for block in range(0, num_segments + 1, 1024):
+        stop = min(block + 1024, num_segments + 1)
+        seed_angle = start_angle + block * step
+        z[block] = complex(math.cos(seed_angle), math.sin(seed_angle))
+        if stop - block > 1:
+            z[block + 1:stop] = z[block] * np.cumprod(np.full(stop - block - 1, rotation))
+    points = np.empty((num_segments + 1, 2))
+    points[:, 0] = cx + radius * z.real
+    points[:, 1] = cy + radius * z.imag
+    return points
+
+@functools.lru_cache(maxsize=8)
+def _load_dxf_cached(dxf_path, mtime):
+    # mtime 只作為快取 key，檔案一變動 key 就不同，舊的解析結果自然失效
+    return ezdxf.readfile(dxf_path)
 
 class DXFToSVG:
     def __init__(self):
@@ -11,105 +104,125 @@ class DXFToSVG:
         self.svg_height = 600
         self.stroke_width = 1
         self.stroke_color = "#000000"
+        self.pretty = False  # True 時輸出縮排過的 SVG（檔案較大、寫入較慢）
 
     def load_dxf(self, dxf_path):
         try:
-            doc = ezdxf.readfile(dxf_path)
-            return doc
+            # 以 (路徑, 修改時間) 當快取 key，檔案沒變動就直接重用解析結果
+            return _load_dxf_cached(dxf_path, os.path.getmtime(dxf_path))
         except Exception as e:
             print(f"載入 DXF 檔案失敗: {e}")
             return None
 
-    def extract_all_lines(self, doc):
-        msp = doc.modelspace()
+    def iter_modelspace(self, dxf_path):
+        # 逐實體掃描 DXF，不建立完整文件圖（區塊、表格等），大檔案省時省記憶體；
+        # iterdxf 無法處理時退回完整解析
+        try:
+            reader = iterdxf.opendxf(dxf_path)
+        except Exception:
+            doc = ezdxf.readfile(dxf_path)
+            yield from doc.modelspace()
+            return
+        try:
+            yield from reader.modelspace()
+        finally:
+            reader.close()
+
+    def _extract_line(self, entity):
+        points = np.array([(entity.dxf.start.x, entity.dxf.start.y),
+                           (entity.dxf.end.x, entity.dxf.end.y)])
+        return {'type': 'LINE', 'points': points, 'closed': False}
+
+    def _extract_lwpolyline(self, entity):
+        # format code 'xy'：ezdxf 直接給 (x, y) 序列，免去逐點切片
+        points = np.array(entity.get_points('xy'), dtype=np.float64)
+        return {'type': 'LWPOLYLINE', 'points': points, 'closed': entity.closed}
+
+    def _extract_polyline(self, entity):
+        # points() 一次給出所有頂點，避開 vertex.dxf.location 的屬性鏈
+        points = np.array(list(entity.points()), dtype=np.float64)[:, :2]
+        return {'type': 'POLYLINE', 'points': points, 'closed': entity.is_closed}
+
+    def _extract_arc(self, entity):
+        center = entity.dxf.center
+        radius = entity.dxf.radius
+        start_angle = math.radians(entity.dxf.start_angle)
+        end_angle = math.radians(entity.dxf.end_angle)
+        if end_angle < start_angle:
+            end_angle += 2 * math.pi
+        # 取樣延後到 normalize_coordinates：那時才知道世界座標對像素的縮放，
+        # 段數可以用「畫面上」的弦高誤差決定；這裡只給精確邊界點
+        return {
+            'type': 'ARC',
+            'points': _arc_bbox_points(center.x, center.y, radius,
+                                       start_angle, end_angle),
+            'closed': False,
+            'center': (center.x, center.y),
+            'radius': radius,
+            'start_angle': start_angle,
+            'end_angle': end_angle,
+        }
+
+    def _extract_circle(self, entity):
+        center = entity.dxf.center
+        points = _circle_bezier_points(center.x, center.y, entity.dxf.radius)
+        return {'type': 'CIRCLE_BEZIER', 'points': points, 'closed': True}
+
+    _EXTRACTORS = {
+        'LINE': _extract_line,
+        'LWPOLYLINE': _extract_lwpolyline,
+        'POLYLINE': _extract_polyline,
+        'ARC': _extract_arc,
+        'CIRCLE': _extract_circle,
+    }
+
+    def extract_all_lines(self, doc, layer_name=None):
+        # doc 可以是完整的 ezdxf 文件，也可以是 iter_modelspace 給的實體疊代器
+        msp = doc.modelspace() if hasattr(doc, 'modelspace') else doc
         line_entities = []
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+        extractors = self._EXTRACTORS
         for entity in msp:
-            if entity.dxftype() == 'LINE':
-                line_entities.append({
-                    'type': 'LINE',
-                    'start': (entity.dxf.start.x, entity.dxf.start.y),
-                    'end': (entity.dxf.end.x, entity.dxf.end.y),
-                    'layer': entity.dxf.layer,
-                    'color': getattr(entity.dxf, 'color', 7)
-                })
-            elif entity.dxftype() == 'LWPOLYLINE':
-                points = [(point[0], point[1]) for point in entity.get_points()]
-                line_entities.append({
-                    'type': 'LWPOLYLINE',
-                    'points': points,
-                    'closed': entity.closed,
-                    'layer': entity.dxf.layer,
-                    'color': getattr(entity.dxf, 'color', 7)
-                })
-            elif entity.dxftype() == 'POLYLINE':
-                points = [(vertex.dxf.location.x, vertex.dxf.location.y)
-                          for vertex in entity.vertices]
-                line_entities.append({
-                    'type': 'POLYLINE',
-                    'points': points,
-                    'closed': entity.closed,
-                    'layer': entity.dxf.layer,
-                    'color': getattr(entity.dxf, 'color', 7)
-                })
-            elif entity.dxftype() == 'ARC':
-                center = entity.dxf.center
-                radius = entity.dxf.radius
-                start_angle = math.radians(entity.dxf.start_angle)
-                end_angle = math.radians(entity.dxf.end_angle)
-                if end_angle < start_angle:
-                    end_angle += 2 * math.pi
-                num_segments = max(8, int((end_angle - start_angle) * radius / 10))
-                angle_step = (end_angle - start_angle) / num_segments
-                arc_points = []
-                for i in range(num_segments + 1):
-                    angle = start_angle + i * angle_step
-                    x = center.x + radius * math.cos(angle)
-                    y = center.y + radius * math.sin(angle)
-                    arc_points.append((x, y))
-                line_entities.append({
-                    'type': 'ARC_SEGMENTS',
-                    'points': arc_points,
-                    'closed': False,
-                    'layer': entity.dxf.layer,
-                    'color': getattr(entity.dxf, 'color', 7)
-                })
-            elif entity.dxftype() == 'CIRCLE':
-                center = entity.dxf.center
-                radius = entity.dxf.radius
-                num_segments = 32
-                angle_step = 2 * math.pi / num_segments
-                circle_points = []
-                for i in range(num_segments + 1):
-                    angle = i * angle_step
-                    x = center.x + radius * math.cos(angle)
-                    y = center.y + radius * math.sin(angle)
-                    circle_points.append((x, y))
-                line_entities.append({
-                    'type': 'CIRCLE_SEGMENTS',
-                    'points': circle_points,
-                    'closed': True,
-                    'layer': entity.dxf.layer,
-                    'color': getattr(entity.dxf, 'color', 7)
-                })
-        return line_entities
+            extractor = extractors.get(entity.dxftype())
+            if extractor is None:
+                continue
+            # 指定圖層時先比對再抽取座標，其他圖層的實體完全不處理
+            if layer_name is not None and entity.dxf.layer != layer_name:
+                continue
+            extracted = extractor(self, entity)
+            extracted['layer'] = entity.dxf.layer
+            extracted['color'] = getattr(entity.dxf, 'color', 7)
+            line_entities.append(extracted)
+            points = extracted['points']
+            if len(points):
+                # 邊界框在抽取時同步累計，省去事後再掃一次所有座標
+                lo = points.min(axis=0)
+                hi = points.max(axis=0)
+                if lo[0] < min_x:
+                    min_x = lo[0]
+                if lo[1] < min_y:
+                    min_y = lo[1]
+                if hi[0] > max_x:
+                    max_x = hi[0]
+                if hi[1] > max_y:
+                    max_y = hi[1]
+        if not line_entities or min_x == math.inf:
+            return line_entities, (0, 0, 100, 100)
+        return line_entities, (min_x, min_y, max_x, max_y)
 
     def get_bounding_box(self, entities):
         if not entities:
             return 0, 0, 100, 100
-        x_coords = []
-        y_coords = []
-        for entity in entities:
-            if entity['type'] == 'LINE':
-                x_coords.extend([entity['start'][0], entity['end'][0]])
-                y_coords.extend([entity['start'][1], entity['end'][1]])
-            else:
-                for point in entity['points']:
-                    x_coords.append(point[0])
-                    y_coords.append(point[1])
-        return min(x_coords), min(y_coords), max(x_coords), max(y_coords)
+        all_points = np.vstack([entity['points'] for entity in entities])
+        min_x, min_y = all_points.min(axis=0)
+        max_x, max_y = all_points.max(axis=0)
+        return min_x, min_y, max_x, max_y
 
-    def normalize_coordinates(self, entities, target_width=800, target_height=600, margin=50):
-        min_x, min_y, max_x, max_y = self.get_bounding_box(entities)
+    def normalize_coordinates(self, entities, target_width=800, target_height=600, margin=50, bbox=None):
+        if bbox is None:
+            bbox = self.get_bounding_box(entities)
+        min_x, min_y, max_x, max_y = bbox
         orig_width = max_x - min_x
         orig_height = max_y - min_y
         available_width = target_width - 2 * margin
@@ -121,111 +234,148 @@ class DXFToSVG:
         scaled_height = orig_height * scale
         offset_x = margin + (available_width - scaled_width) / 2
         offset_y = margin + (available_height - scaled_height) / 2
-        normalized_entities = []
+        # 縮放比例確定後才取樣弧線：段數由「像素」弦高誤差決定，
+        # 小弧不會在世界座標下被過度取樣
         for entity in entities:
-            if entity['type'] == 'LINE':
-                new_start = (
-                    (entity['start'][0] - min_x) * scale + offset_x,
-                    target_height - ((entity['start'][1] - min_y) * scale + offset_y)
-                )
-                new_end = (
-                    (entity['end'][0] - min_x) * scale + offset_x,
-                    target_height - ((entity['end'][1] - min_y) * scale + offset_y)
-                )
-                normalized_entities.append({
-                    'type': 'LINE',
-                    'start': new_start,
-                    'end': new_end,
-                    'layer': entity['layer'],
-                    'color': entity['color']
-                })
+            if entity['type'] == 'ARC':
+                sweep = entity['end_angle'] - entity['start_angle']
+                num_segments = _arc_segment_count(entity['radius'] * scale, sweep)
+                cx, cy = entity['center']
+                entity['points'] = _tessellate_arc(cx, cy, entity['radius'],
+                                                   entity['start_angle'],
+                                                   entity['end_angle'], num_segments)
+                entity['type'] = 'ARC_SEGMENTS'
+        # 將所有座標堆成一個 (M, 2) 陣列，原地做一次仿射轉換（含 Y 軸翻轉），
+        # 再以視圖切回各實體——不複製幾何、也不重建實體 dict
+        arrays = [np.asarray(entity['points'], dtype=np.float64) for entity in entities]
+        offsets = np.cumsum([0] + [len(a) for a in arrays])
+        all_points = np.vstack(arrays)
+        all_points -= (min_x, min_y)
+        all_points *= scale
+        all_points += (offset_x, offset_y)
+        all_points[:, 1] = target_height - all_points[:, 1]
+        for i, entity in enumerate(entities):
+            entity['points'] = all_points[offsets[i]:offsets[i + 1]]
+        return entities
+
+    @staticmethod
+    def get_color_by_index(color_index):
+        if 0 <= color_index < 256:
+            return ACI_COLOR_TABLE[color_index]
+        return "#000000"
+
+    def entity_to_svg_string(self, entity, attrs):
+        points = entity['points']
+        if len(points) == 0:
+            return ""
+        if entity['type'] == 'CIRCLE_BEZIER':
+            num_curves = (len(points) - 1) // 3
+            fmt = ("M%d.%02d,%d.%02d"
+                   + " C%d.%02d,%d.%02d %d.%02d,%d.%02d %d.%02d,%d.%02d" * num_curves
+                   + " Z")
+            return PATH_TEMPLATE % (fmt % tuple(_fixed2(points)), attrs)
+        # CAD 匯出常夾帶零長度線段與重複頂點：位移低於半像素的點先剔除，
+        # 退化到一個點的實體整個略過
+        if len(points) > 1:
+            deltas = np.abs(np.diff(points, axis=0)).sum(axis=1)
+            keep = np.empty(len(points), dtype=bool)
+            keep[0] = True
+            keep[1:] = deltas > DEGENERATE_PX_TOLERANCE
+            points = points[keep]
+        if len(points) < 2:
+            return ""
+        values = _fixed2(points)
+        if entity['type'] == 'LINE':
+            return LINE_TEMPLATE % tuple(values + [attrs])
+        # 整條路徑用一次 % 格式化，避免逐點產生中間字串
+        fmt = "M%d.%02d,%d.%02d" + " L%d.%02d,%d.%02d" * (len(points) - 1)
+        d = fmt % tuple(values) + PATH_SUFFIX[bool(entity['closed'])]
+        return PATH_TEMPLATE % (d, attrs)
+
+    def _line_run_to_svg(self, run, attrs):
+        # 連續且同色的 LINE 合併成一個 <path>：首尾相接的線段省掉重複的 M
+        if len(run) == 1:
+            return self.entity_to_svg_string(run[0], attrs)
+        parts = []
+        prev_end = None
+        for entity in run:
+            points = entity['points']
+            if (abs(points[1][0] - points[0][0])
+                    + abs(points[1][1] - points[0][1])) <= DEGENERATE_PX_TOLERANCE:
+                continue  # 零長度線段
+            values = _fixed2(points)
+            if prev_end is not None and (abs(points[0][0] - prev_end[0])
+                                         + abs(points[0][1] - prev_end[1])) <= DEGENERATE_PX_TOLERANCE:
+                parts.append("L%d.%02d,%d.%02d" % tuple(values[4:]))
             else:
-                new_points = []
-                for point in entity['points']:
-                    new_point = (
-                        (point[0] - min_x) * scale + offset_x,
-                        target_height - ((point[1] - min_y) * scale + offset_y)
-                    )
-                    new_points.append(new_point)
-                normalized_entities.append({
-                    'type': entity['type'],
-                    'points': new_points,
-                    'closed': entity.get('closed', False),
-                    'layer': entity['layer'],
-                    'color': entity['color']
-                })
-        return normalized_entities
-
-    def get_color_by_index(self, color_index):
-        color_map = {
-            1: "#FF0000", 2: "#FFFF00", 3: "#00FF00", 4: "#00FFFF", 5: "#0000FF", 6: "#FF00FF", 7: "#FFFFFF", 8: "#808080", 9: "#C0C0C0", 10: "#800000", 11: "#808000", 12: "#008000", 13: "#008080", 14: "#000080", 15: "#800080",
-        }
-        return color_map.get(color_index, "#000000")
+                parts.append("M%d.%02d,%d.%02d L%d.%02d,%d.%02d" % tuple(values))
+            prev_end = points[1]
+        if not parts:
+            return ""
+        return PATH_TEMPLATE % (" ".join(parts), attrs)
 
-    def entities_to_svg_elements(self, entities):
-        svg_elements = []
+    def write_svg_stream(self, entities, fp):
+        fp.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        fp.write(f'<svg width="{self.svg_width}" height="{self.svg_height}" '
+                 f'viewBox="0 0 {self.svg_width} {self.svg_height}" '
+                 f'xmlns="http://www.w3.org/2000/svg">\n')
+        # 所有實體共用的呈現屬性寫在外層 <g> 一次，元素本身只帶 stroke 顏色
+        group_indent = "  " if self.pretty else ""
+        fp.write(f'{group_indent}<g stroke-width="{self.stroke_width}"'
+                 ' stroke-linecap="round" stroke-linejoin="round" fill="none">\n')
+        indent = "    " if self.pretty else ""
+        # 熱迴圈會跑過每個實體：屬性查找一律提出來成局部變數
+        color_of = self.get_color_by_index
+        to_string = self.entity_to_svg_string
+        write = fp.write
+        # 每個顏色索引只渲染一次 stroke 屬性字串
+        stroke_cache = {}
+        cache_get = stroke_cache.get
+        line_run = []  # 收集連續同色的 LINE，成段合併輸出
+        line_run_attrs = ""
         for entity in entities:
-            color = self.get_color_by_index(entity['color'])
+            color_index = entity['color']
+            attrs = cache_get(color_index)
+            if attrs is None:
+                attrs = stroke_cache[color_index] = f' stroke="{color_of(color_index)}"'
             if entity['type'] == 'LINE':
-                from xml.etree.ElementTree import Element
-                line = Element('line')
-                line.set('x1', f"{entity['start'][0]:.2f}")
-                line.set('y1', f"{entity['start'][1]:.2f}")
-                line.set('x2', f"{entity['end'][0]:.2f}")
-                line.set('y2', f"{entity['end'][1]:.2f}")
-                line.set('stroke', color)
-                line.set('stroke-width', str(self.stroke_width))
-                line.set('stroke-linecap', 'round')
-                svg_elements.append(line)
-            else:
-                if not entity['points']:
-                    continue
-                path = Element('path')
-                path_parts = []
-                first_point = entity['points'][0]
-                path_parts.append(f"M{first_point[0]:.2f},{first_point[1]:.2f}")
-                for point in entity['points'][1:]:
-                    path_parts.append(f"L{point[0]:.2f},{point[1]:.2f}")
-                if entity.get('closed', False):
-                    path_parts.append("Z")
-                path.set('d', " ".join(path_parts))
-                path.set('stroke', color)
-                path.set('stroke-width', str(self.stroke_width))
-                path.set('stroke-linecap', 'round')
-                path.set('stroke-linejoin', 'round')
-                path.set('fill', 'none')
-                svg_elements.append(path)
-        return svg_elements
-
-    def create_svg(self, entities):
-        svg = Element('svg')
-        svg.set('width', str(self.svg_width))
-        svg.set('height', str(self.svg_height))
-        svg.set('viewBox', f'0 0 {self.svg_width} {self.svg_height}')
-        svg.set('xmlns', 'http://www.w3.org/2000/svg')
-        svg_elements = self.entities_to_svg_elements(entities)
-        for element in svg_elements:
-            svg.append(element)
-        return svg
+                if line_run and attrs != line_run_attrs:
+                    element = self._line_run_to_svg(line_run, line_run_attrs)
+                    if element:
+                        write(indent + element)
+                    line_run = []
+                line_run.append(entity)
+                line_run_attrs = attrs
+                continue
+            if line_run:
+                element = self._line_run_to_svg(line_run, line_run_attrs)
+                if element:
+                    write(indent + element)
+                line_run = []
+            element = to_string(entity, attrs)
+            if element:
+                write(indent + element)
+        if line_run:
+            element = self._line_run_to_svg(line_run, line_run_attrs)
+            if element:
+                write(indent + element)
+        fp.write(f'{group_indent}</g>\n</svg>\n')
 
     def convert_dxf_to_svg(self, dxf_path, output_path=None):
-        doc = self.load_dxf(dxf_path)
-        if not doc:
+        try:
+            entities, bbox = self.extract_all_lines(self.iter_modelspace(dxf_path))
+        except Exception as e:
+            print(f"載入 DXF 檔案失敗: {e}")
             return False, "無法載入 DXF 檔案"
-        entities = self.extract_all_lines(doc)
         if not entities:
             return False, "DXF 檔案中沒有找到線條"
-        normalized_entities = self.normalize_coordinates(entities, self.svg_width, self.svg_height)
-        svg = self.create_svg(normalized_entities)
-        rough_string = tostring(svg, 'unicode')
-        reparsed = parseString(rough_string)
-        formatted_svg = reparsed.toprettyxml(indent="  ")
+        normalized_entities = self.normalize_coordinates(entities, self.svg_width, self.svg_height, bbox=bbox)
         if output_path is None:
             base_name = os.path.splitext(dxf_path)[0]
             output_path = f"{base_name}.svg"
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(formatted_svg)
+                self.write_svg_stream(normalized_entities, f)
             return True, f"成功轉換為 SVG: {output_path}"
         except Exception as e:
             return False, f"儲存 SVG 檔案失敗: {e}" 
\ No newline at end of file
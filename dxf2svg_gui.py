@@ -2,9 +2,11 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
+import queue
 import threading
 import subprocess
 import platform
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dxf2svg_core import DXFToSVG
 
 class DXFToSVGGUI:
@@ -15,8 +17,10 @@ class DXFToSVGGUI:
         self.converter = DXFToSVG()
         self.dxf_paths = []  # 多檔案路徑
         self.output_dir = tk.StringVar()
+        self._log_queue = queue.Queue()
         self.setup_styles()
         self.create_widgets()
+        self.root.after(50, self._pump_log)
 
     def setup_styles(self):
         style = ttk.Style()
@@ -103,6 +107,7 @@ class DXFToSVGGUI:
             self.converter.svg_width = int(self.svg_width_var.get())
             self.converter.svg_height = int(self.svg_height_var.get())
             self.converter.stroke_width = float(self.stroke_width_var.get())
+            self.converter.pretty = bool(self.pretty_var.get())
         except ValueError:
             messagebox.showerror("錯誤", "請輸入有效的數值")
             return
@@ -116,15 +121,22 @@ class DXFToSVGGUI:
 
     def perform_batch_conversion(self):
         try:
-            for dxf_path in self.dxf_paths:
-                base_name = os.path.splitext(os.path.basename(dxf_path))[0]
-                output_svg = os.path.join(self.output_dir.get(), base_name + ".svg")
-                self.log_message(f"開始轉換: {dxf_path}")
-                success, message = self.converter.convert_dxf_to_svg(dxf_path, output_svg)
-                if success:
-                    self.log_message(f"✓ {message}")
-                else:
-                    self.log_message(f"✗ {message}")
+            # 每個 DXF 的轉換是獨立且 CPU 密集的工作，交給子行程平行處理
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = {}
+                for dxf_path in self.dxf_paths:
+                    base_name = os.path.splitext(os.path.basename(dxf_path))[0]
+                    output_svg = os.path.join(self.output_dir.get(), base_name + ".svg")
+                    self.log_message(f"開始轉換: {dxf_path}")
+                    future = executor.submit(self.converter.convert_dxf_to_svg,
+                                             dxf_path, output_svg)
+                    futures[future] = dxf_path
+                for future in as_completed(futures):
+                    success, message = future.result()
+                    if success:
+                        self.log_message(f"✓ {message}")
+                    else:
+                        self.log_message(f"✗ {message}")
             self.status_var.set("批次轉換完成")
             self.enable_open_button()
             messagebox.showinfo("完成", "所有 DXF 已批次轉換完成！")
@@ -184,6 +196,10 @@ class DXFToSVGGUI:
         self.stroke_width_var = tk.StringVar(value="1")
         ttk.Entry(settings_frame, textvariable=self.stroke_width_var, width=10, style='TEntry').grid(row=1, column=1, padx=8, pady=12)
 
+        # 排版輸出設定
+        self.pretty_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="縮排 SVG 輸出", variable=self.pretty_var).grid(row=1, column=3, padx=8, pady=12, sticky='w')
+
     def create_convert_button(self):
         button_frame = ttk.Frame(self.root, style='TFrame')
         button_frame.pack(fill='x', padx=48, pady=18)
@@ -295,9 +311,21 @@ class DXFToSVGGUI:
         self.convert_button.config(state='normal')
 
     def log_message(self, message):
-        self.log_text.insert('end', f"{message}\n")
-        self.log_text.see('end')
-        self.root.update_idletasks()
+        # 可能從工作執行緒呼叫：只丟進佇列，由 Tk 主迴圈的 _pump_log 寫入畫面
+        self._log_queue.put(message)
+
+    def _pump_log(self):
+        drained = False
+        while True:
+            try:
+                message = self._log_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.log_text.insert('end', f"{message}\n")
+            drained = True
+        if drained:
+            self.log_text.see('end')
+        self.root.after(50, self._pump_log)
 
 # 啟動點
 if __name__ == "__main__":
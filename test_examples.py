@@ -5,21 +5,25 @@
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 from main import RebarDXFToSVG
-from collections import defaultdict, deque
+from collections import defaultdict
 
 def find_dxf_files(root_dir):
     """遞迴搜尋所有 DXF 檔案"""
+    # os.scandir 的 DirEntry 自帶型別資訊，不用像 os.walk 再為每個項目 stat 一次
     dxf_files = []
-    for root, dirs, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith('.dxf'):
-                dxf_files.append(os.path.join(root, file))
+    for entry in os.scandir(root_dir):
+        if entry.is_dir():
+            dxf_files.extend(find_dxf_files(entry.path))
+        elif entry.name.endswith('.dxf'):
+            dxf_files.append(entry.path)
     return dxf_files
 
 def point_key(pt, tol=1e-4):
     """將點座標轉為可比較的 key（含容差）"""
-    return (round(pt[0]/tol)*tol, round(pt[1]/tol)*tol)
+    # 直接用整數格子編號當 key：少兩次浮點乘法，也避免 round 後的浮點誤差影響雜湊
+    return (round(pt[0] / tol), round(pt[1] / tol))
 
 def group_lines_and_polylines(entities, tol=1e-4):
     """
@@ -34,38 +38,81 @@ def group_lines_and_polylines(entities, tol=1e-4):
             groups.append([entity])
             used.add(idx)
     # 對 LINE 進行分群
-    # 建立端點到 index 的對應
+    # 建立端點到 index 的對應，端點 key 只算一次並快取給後面的 BFS 用
     point_to_lines = defaultdict(list)
+    line_endpoints = {}
     for idx, entity in enumerate(entities):
         if entity['type'] == 'LINE' and idx not in used:
-            start = point_key(entity['start'], tol)
-            end = point_key(entity['end'], tol)
+            points = entity['points']
+            start = point_key(points[0], tol)
+            end = point_key(points[1], tol)
+            line_endpoints[idx] = (start, end)
             point_to_lines[start].append(idx)
             point_to_lines[end].append(idx)
-    # BFS 分群
-    visited = set()
-    for idx, entity in enumerate(entities):
-        if entity['type'] != 'LINE' or idx in used or idx in visited:
-            continue
-        group = []
-        queue = deque([idx])
-        while queue:
-            cur = queue.popleft()
-            if cur in visited:
-                continue
-            visited.add(cur)
-            group.append(entities[cur])
-            # 找到與當前線段首尾相連的其他線段
-            for pt in [point_key(entities[cur]['start'], tol), point_key(entities[cur]['end'], tol)]:
-                for neighbor in point_to_lines[pt]:
-                    if neighbor != cur and neighbor not in visited:
-                        queue.append(neighbor)
-        if group:
-            groups.append(group)
+    # Union-Find 連通分量：同一端點桶內的線段全部 union，比 BFS 少掉佇列與 visited 集合
+    parent = {idx: idx for idx in line_endpoints}
+
+    def find(i):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:  # 路徑壓縮
+            parent[i], i = root, parent[i]
+        return root
+
+    for bucket in point_to_lines.values():
+        first = find(bucket[0])
+        for other in bucket[1:]:
+            parent[find(other)] = first
+    components = defaultdict(list)
+    for idx in line_endpoints:
+        components[find(idx)].append(entities[idx])
+    groups.extend(components.values())
     return groups
 
-def test_dxf_entities():
+def _convert_one(dxf_path):
+    """轉換單一 DXF（在子行程執行，須為模組層級函式才能 pickle）"""
     converter = RebarDXFToSVG()
+    base_name = os.path.splitext(os.path.basename(dxf_path))[0]
+    output_dir = os.path.dirname(dxf_path)
+    messages = [f"\n正在處理: {os.path.basename(dxf_path)}",
+                f"檔案路徑: {dxf_path}"]
+    try:
+        doc = converter.load_dxf(dxf_path)
+        if not doc:
+            messages.append(f"❌ 載入失敗: {os.path.basename(dxf_path)}")
+            return messages
+        entities = converter.extract_rebar_lines(doc, layer_name="1號線")
+        if not entities:
+            messages.append(f"❌ 找不到線條實體: {os.path.basename(dxf_path)}")
+            return messages
+        # 自動分群
+        groups = group_lines_and_polylines(entities)
+        messages.append(f"  共分群 {len(groups)} 組（自動合併首尾相連的 LINE）")
+        for idx, group in enumerate(groups, 1):
+            normalized = converter.normalize_coordinates(group)
+            rebar_type = converter.identify_rebar_type(normalized)
+            path_data = converter.entities_to_svg_paths(normalized)
+            text_positions = converter.get_text_positions(rebar_type, normalized)
+            svg_element = converter.create_svg(path_data, rebar_type, text_positions)
+            from xml.etree.ElementTree import tostring
+            from xml.dom.minidom import parseString
+            rough_string = tostring(svg_element, 'unicode')
+            pretty_svg = parseString(rough_string).toprettyxml(indent="  ")
+            # 去掉第一行的 XML 宣告：找第一個換行後切片即可，不必整份切開再重組
+            newline_idx = pretty_svg.find('\n')
+            if newline_idx >= 0:
+                pretty_svg = pretty_svg[newline_idx + 1:]
+            output_name = f"{base_name}_group{idx}.svg"
+            output_path = os.path.join(output_dir, output_name)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(pretty_svg)
+            messages.append(f"    ✅ 輸出: {output_name}")
+    except Exception as e:
+        messages.append(f"❌ 處理 {os.path.basename(dxf_path)} 時發生錯誤: {e}")
+    return messages
+
+def test_dxf_entities():
     assets_dir = "assets"
     if not os.path.exists(assets_dir):
         print(f"錯誤：找不到 {assets_dir} 資料夾")
@@ -78,41 +125,11 @@ def test_dxf_entities():
     for file in dxf_files:
         print(f"  - {file}")
     print("\n開始自動分群並轉換...")
-    for dxf_path in dxf_files:
-        base_name = os.path.splitext(os.path.basename(dxf_path))[0]
-        output_dir = os.path.dirname(dxf_path)
-        print(f"\n正在處理: {os.path.basename(dxf_path)}")
-        print(f"檔案路徑: {dxf_path}")
-        try:
-            doc = converter.load_dxf(dxf_path)
-            if not doc:
-                print(f"❌ 載入失敗: {os.path.basename(dxf_path)}")
-                continue
-            entities = converter.extract_rebar_lines(doc, layer_name="1號線")
-            if not entities:
-                print(f"❌ 找不到線條實體: {os.path.basename(dxf_path)}")
-                continue
-            # 自動分群
-            groups = group_lines_and_polylines(entities)
-            print(f"  共分群 {len(groups)} 組（自動合併首尾相連的 LINE）")
-            for idx, group in enumerate(groups, 1):
-                normalized = converter.normalize_coordinates(group)
-                rebar_type = converter.identify_rebar_type(normalized)
-                path_data = converter.entities_to_svg_paths(normalized)
-                text_positions = converter.get_text_positions(rebar_type, normalized)
-                svg_element = converter.create_svg(path_data, rebar_type, text_positions)
-                from xml.etree.ElementTree import tostring
-                from xml.dom.minidom import parseString
-                rough_string = tostring(svg_element, 'unicode')
-                pretty_svg = parseString(rough_string).toprettyxml(indent="  ")
-                pretty_svg = '\n'.join(pretty_svg.split('\n')[1:])
-                output_name = f"{base_name}_group{idx}.svg"
-                output_path = os.path.join(output_dir, output_name)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(pretty_svg)
-                print(f"    ✅ 輸出: {output_name}")
-        except Exception as e:
-            print(f"❌ 處理 {os.path.basename(dxf_path)} 時發生錯誤: {e}")
+    # 每個檔案的轉換彼此獨立，交給子行程平行跑；輸出照原本檔案順序印出
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for messages in executor.map(_convert_one, dxf_files):
+            for message in messages:
+                print(message)
     print(f"\n全部完成！請檢查各資料夾中的 SVG 檔案。")
 
 if __name__ == "__main__":